@@ -1,5 +1,6 @@
 import tokenize
 from collections import deque
+from functools import lru_cache
 from io import StringIO
 from tokenize import COMMENT, DEDENT, INDENT, NEWLINE, OP, STRING
 
@@ -96,3 +97,21 @@ def minify(code: str) -> str:
         last_lineno = end_line
 
     return "".join(out)
+
+
+_MINIFY_CACHE_MAX_LEN = 4096
+
+
+@lru_cache(maxsize=512)
+def _minify_cached(code: str) -> str:
+    return minify(code)
+
+
+def minify_cached(code: str) -> str:
+    """Memoized ``minify`` for commands that are frequently re-sent.
+
+    Large code is minified directly; it's rarely re-sent and would pin memory in the cache.
+    """
+    if len(code) > _MINIFY_CACHE_MAX_LEN:
+        return minify(code)
+    return _minify_cached(code)
@@ -2,6 +2,7 @@ import ast
 import atexit
 import concurrent.futures
 import contextlib
+import json
 import linecache
 import re
 import shutil
@@ -16,7 +17,7 @@ from serial import SerialException
 from serial.tools.miniterm import Miniterm
 from typing_extensions import ParamSpec
 
-from ._minify import minify as minify_code
+from ._minify import minify_cached as minify_code
 from .device_meta import DeviceMeta
 from .device_support import Implementation, MethodMetadata, sort_executers
 from .device_sync_support import (
@@ -53,10 +54,38 @@ else:
 P = ParamSpec("P")
 R = TypeVar("R")
 
+_json_fast_path_chars = frozenset("-0123456789[")
+_traceback_frame_re = re.compile(r'\s*File "([^"]*)", line (\d+), in (\S+)')
+
+
+def _literal_eval(line: str):
+    """``ast.literal_eval`` with a ``json`` fast-path.
+
+    Numbers and lists of numbers (e.g. sensor readings) have identical
+    python and JSON representations, and ``json`` parses them far faster.
+    Anything JSON can't represent (tuples, bytes, sets, ``True``, ...) falls back.
+    """
+    if line[:1] in _json_fast_path_chars:
+        with contextlib.suppress(ValueError):
+            return json.loads(line)
+    return ast.literal_eval(line)
+
+
+def _compact_repr(obj) -> str:
+    """``repr`` of a ``list``, ``set`` or ``dict`` of literals without spaces after separators.
+
+    Keeps generated commands small without running them through the minifier.
+    """
+    if isinstance(obj, dict):
+        return "{" + ",".join(f"{k!r}:{v!r}" for k, v in obj.items()) + "}"
+    if isinstance(obj, set):
+        return "{" + ",".join(map(repr, obj)) + "}" if obj else "set()"
+    return "[" + ",".join(map(repr, obj)) + "]"
+
 
 def parse_belay_response(
     line: str,
-    result_parser: Callable[[str], Any] = ast.literal_eval,
+    result_parser: Callable[[str], Any] = _literal_eval,
 ):
     """Parse a Belay response string into a python object.
 
@@ -97,6 +126,8 @@ class Device(metaclass=DeviceMeta):
     """
 
     MAX_CMD_HISTORY_LEN = 1000
+    SYNC_HASH_BATCH_SIZE = 64
+    SYNC_MANIFEST = "/.belay_manifest.json"
 
     def __init__(
         self,
@@ -240,8 +271,8 @@ class Device(metaclass=DeviceMeta):
         names : str
             Snippet(s) to load and execute.
         """
-        snippets = [read_snippet(name) for name in names]
-        return self("\n".join(snippets))
+        snippets = [read_snippet(name, minify=True) for name in names]
+        return self("\n".join(snippets), minify=False)
 
     def __call__(
         self,
@@ -331,6 +362,7 @@ class Device(metaclass=DeviceMeta):
         minify: bool = True,
         mpy_cross_binary: Union[str, Path, None] = None,
         progress_update=None,
+        cache_hashes: bool = False,
     ) -> None:
         """Sync a local directory to the remote filesystem.
 
@@ -362,6 +394,11 @@ class Device(metaclass=DeviceMeta):
             Takes precedence over minifying.
         progress_update:
             Partial for ``rich.progress.Progress.update(task_id,...)`` to update with sync status.
+        cache_hashes: bool
+            Cache on-device file hashes in ``Device.SYNC_MANIFEST``, keyed on each file's mtime and size.
+            Unchanged remote files then don't need to be re-hashed on subsequent syncs.
+            Only enable if the device's filesystem reliably updates mtime.
+            Defaults to ``False``.
         """
         folder = Path(folder).resolve()
 
@@ -392,12 +429,16 @@ class Device(metaclass=DeviceMeta):
         else:
             snippets_to_execute.append("ilistdir_micropython")
         snippets_to_execute.append("sync_begin")
+        if cache_hashes:
+            snippets_to_execute.append("sync_hash_cache")
         self._exec_snippet(*snippets_to_execute)
 
         # Remove the keep files from the on-device ``all_files`` set
         # so they don't get deleted.
         keep_all = folder.is_file() or keep is True
         keep = preprocess_keep(keep, dst)
+        if cache_hashes:
+            keep.append(self.SYNC_MANIFEST)
         ignore = preprocess_ignore(ignore)
 
         src_files, src_dirs, dst_files = discover_files_dirs(dst, folder, ignore)
@@ -411,14 +452,20 @@ class Device(metaclass=DeviceMeta):
 
         if keep_all:
             self("del __belay_del_fs")
+        elif cache_hashes:
+            self(
+                f"__belay_del_fs_cached({dst!r},{_compact_repr(set(keep + dst_files))},{self.SYNC_MANIFEST!r});"
+                "del __belay_del_fs",
+                minify=False,
+            )
         else:
-            self(f"__belay_del_fs({repr(dst)}, {repr(set(keep + dst_files))}); del __belay_del_fs")
+            self(f"__belay_del_fs({dst!r},{_compact_repr(set(keep + dst_files))});del __belay_del_fs", minify=False)
 
         # Try and make all remote dirs
         if dst_dirs:
             if progress_update:
                 progress_update(description="Creating remote directories...")
-            self(f"__belay_mkdirs({repr(dst_dirs)})")
+            self(f"__belay_mkdirs({_compact_repr(dst_dirs)})", minify=False)
 
         with TemporaryDirectory() as tmp_dir, concurrent.futures.ThreadPoolExecutor() as executor:
             tmp_dir = Path(tmp_dir)
@@ -431,7 +478,16 @@ class Device(metaclass=DeviceMeta):
             # Get all remote hashes
             if progress_update:
                 progress_update(description="Fetching remote hashes...")
-            dst_hashes = self(f"__belay_hfs({repr(dst_files)})")
+            # Query in batches to bound command size and on-device memory.
+            # Generated one-off commands are built compactly; don't minify (and cache) them.
+            dst_hashes = []
+            for i in range(0, len(dst_files), self.SYNC_HASH_BATCH_SIZE):
+                batch = dst_files[i : i + self.SYNC_HASH_BATCH_SIZE]
+                if cache_hashes:
+                    cmd = f"__belay_hfs_cached({_compact_repr(batch)},{self.SYNC_MANIFEST!r})"
+                else:
+                    cmd = f"__belay_hfs({_compact_repr(batch)})"
+                dst_hashes.extend(self(cmd, minify=False))
 
             if len(dst_hashes) != len(dst_files):
                 raise InternalError
@@ -439,18 +495,30 @@ class Device(metaclass=DeviceMeta):
             puts = []
             for (src_file, src_hash), dst_file, dst_hash in zip(src_files_and_hashes, dst_files, dst_hashes):
                 if src_hash != dst_hash:
-                    puts.append((src_file, dst_file))
+                    puts.append((src_file, dst_file, src_hash))
+
+            # Largest files first; remaining progress is then dominated by quick transfers.
+            puts.sort(key=lambda x: x[0].stat().st_size, reverse=True)
 
             if progress_update:
                 progress_update(total=len(puts))
 
-            for src_file, dst_file in puts:
+            for src_file, dst_file, _ in puts:
                 if progress_update:
                     progress_update(description=f"Pushing: {dst_file[1:]}")
                 self._board.fs_put(src_file, dst_file)
                 if progress_update:
                     progress_update(advance=1)
 
+            if cache_hashes:
+                # Write the manifest back once, and free it from device memory.
+                cmd = f"__belay_manifest_end({self.SYNC_MANIFEST!r})"
+                if puts:
+                    # We already know the hashes of the freshly written files.
+                    pushed_hashes = {dst_file: src_hash for _, dst_file, src_hash in puts}
+                    cmd = f"__belay_manifest_update({_compact_repr(pushed_hashes)},{self.SYNC_MANIFEST!r});{cmd}"
+                self(cmd, minify=False)
+
     def sync_dependencies(
         self,
         package: Union[ModuleType, str],
@@ -791,6 +859,7 @@ class Device(metaclass=DeviceMeta):
         cmd: str,
         record: bool = True,
         trusted: bool = False,
+        minify: bool = True,
     ):
         """Invoke ``cmd``, and reinterprets raised stacktrace in ``PyboardException``.
 
@@ -814,6 +883,9 @@ class Device(metaclass=DeviceMeta):
             When set to ``True``, any value who's ``repr`` can be evaluated to create a python object can be
             returned. However, **this also allows the remote device to execute arbitrary code on host**.
             Defaults to ``False``.
+        minify: bool
+            Minify ``cmd`` code prior to sending.
+            Defaults to ``True``.
 
         Returns
         -------
@@ -822,7 +894,7 @@ class Device(metaclass=DeviceMeta):
         src_file = str(src_file)
 
         try:
-            res = self(cmd, record=record, trusted=trusted)
+            res = self(cmd, record=record, trusted=trusted, minify=minify)
         except PyboardException as e:
             new_lines = []
 
@@ -831,17 +903,17 @@ class Device(metaclass=DeviceMeta):
             for line in lines:
                 new_lines.append(line)
 
-                try:
-                    file, lineno, fn = line.strip().split(",", 2)
-                except ValueError:
+                match = _traceback_frame_re.match(line)
+                if not match:
                     continue
 
-                if file != 'File "<stdin>"' or fn != f" in {name}":
+                file, lineno, fn = match.groups()
+                if file != "<stdin>" or fn != name:
                     continue
 
-                lineno = int(lineno[6:]) - 1 + src_lineno
+                lineno = int(lineno) - 1 + src_lineno
 
-                new_lines[-1] = f'  File "{src_file}", line {lineno},{fn}'
+                new_lines[-1] = f'  File "{src_file}", line {lineno}, in {fn}'
 
                 # Get what that line actually is.
                 new_lines.append("    " + linecache.getline(src_file, lineno).strip())
@@ -1,38 +1,58 @@
+import os
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Union
 
 from pathspec import PathSpec
-from pathspec.util import append_dir_sep
 
 from ._minify import minify as minify_code
 from .hash import fnv1a
 from .typing import PathType
 
 
+def _walk(root: PathType):
+    """Recursively yield ``(path, is_dir)`` for every object under ``root``.
+
+    ``os.scandir`` entries cache their file type, so no extra ``stat`` is needed per object.
+    Like ``Path.rglob``, symlinked directories are yielded but not descended into,
+    and unreadable subdirectories are skipped.
+    """
+    root = os.fspath(root)
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except PermissionError:
+            if path == root:
+                raise
+            continue
+        with it:
+            for entry in it:
+                is_dir = entry.is_dir()
+                if is_dir and not entry.is_symlink():
+                    stack.append(entry.path)
+                yield entry.path, is_dir
+
+
 def discover_files_dirs(
     remote_dir: str,
     local_file_or_folder: Path,
     ignore: Optional[list] = None,
 ):
-    src_objects = []
     if local_file_or_folder.is_dir():
         if ignore is None:
             ignore = []
         ignore_spec = PathSpec.from_lines("gitwildmatch", ignore)
-        for src_object in local_file_or_folder.rglob("*"):
-            if ignore_spec.match_file(append_dir_sep(src_object)):
+        src_files, src_dirs = [], []
+        for src_object, is_dir in _walk(local_file_or_folder):
+            if ignore_spec.match_file(src_object + os.sep if is_dir else src_object):
                 continue
-            src_objects.append(src_object)
+            (src_dirs if is_dir else src_files).append(Path(src_object))
         # Sort so that folder creation comes before file sending.
-        src_objects.sort()
-
-        src_files, src_dirs = [], []
-        for src_object in src_objects:
-            if src_object.is_dir():
-                src_dirs.append(src_object)
-            else:
-                src_files.append(src_object)
+        src_files.sort()
+        src_dirs.sort()
         dst_files = [remote_dir / src.relative_to(local_file_or_folder) for src in src_files]
     else:
         src_files = [local_file_or_folder]
@@ -81,26 +101,42 @@ def preprocess_src_file(
     tmp_dir = Path(tmp_dir)
     src_file = Path(src_file)
 
+    if src_file.suffix != ".py" or not (mpy_cross_binary or minify):
+        # Sent as-is; don't touch the filesystem.
+        return src_file
+
     transformed = tmp_dir / src_file.relative_to(src_file.anchor) if src_file.is_absolute() else tmp_dir / src_file
     transformed.parent.mkdir(parents=True, exist_ok=True)
 
-    if src_file.suffix == ".py":
-        if mpy_cross_binary:
-            transformed = transformed.with_suffix(".mpy")
-            subprocess.check_output([mpy_cross_binary, "-o", transformed, src_file])  # nosec
-            return transformed
-        elif minify:
-            minified = minify_code(src_file.read_text())
-            transformed.write_text(minified)
-            return transformed
+    if mpy_cross_binary:
+        transformed = transformed.with_suffix(".mpy")
+        subprocess.check_output([mpy_cross_binary, "-o", transformed, src_file])  # nosec
+        return transformed
+
+    transformed.write_text(minify_code(src_file.read_text()))
+    return transformed
 
-    return src_file
 
+@lru_cache(maxsize=4096)
+def _fnv1a_cached(fn: str, mtime_ns: int, size: int) -> int:
+    """Hash of an unmodified file, memoized on its ``stat`` signature."""
+    return fnv1a(fn)
 
-def preprocess_src_file_hash(*args, **kwargs):
-    src_file = preprocess_src_file(*args, **kwargs)
-    src_hash = fnv1a(src_file)
-    return src_file, src_hash
+
+def preprocess_src_file_hash(
+    tmp_dir: PathType,
+    src_file: PathType,
+    minify: bool,
+    mpy_cross_binary: Union[str, Path, None],
+):
+    transformed = preprocess_src_file(tmp_dir, src_file, minify, mpy_cross_binary)
+    if transformed == Path(src_file):
+        # File is sent as-is; re-syncs of unchanged files can skip hashing.
+        stat = transformed.stat()
+        src_hash = _fnv1a_cached(str(transformed), stat.st_mtime_ns, stat.st_size)
+    else:
+        src_hash = fnv1a(transformed)
+    return transformed, src_hash
 
 
 def generate_dst_dirs(dst, src, src_dirs) -> list:
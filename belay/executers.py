@@ -1,12 +1,13 @@
 import inspect
 from abc import abstractmethod
+from binascii import b2a_base64
 from functools import wraps
 from typing import Callable, Optional, TypeVar, Union, overload
 
 from autoregistry import Registry
 from typing_extensions import ParamSpec
 
-from ._minify import minify as _minify
+from ._minify import minify_cached as _minify
 from .exceptions import FeatureUnavailableError, SpecialFunctionNameError
 from .helpers import random_python_identifier, wraps_partial
 from .inspect import getsource
@@ -15,6 +16,32 @@ from .typing import BelayCallable
 P = ParamSpec("P")
 R = TypeVar("R")
 
+# ``bytes`` arguments longer than this are considered for base64-encoding.
+_B64_MIN_LEN = 512
+
+
+def _repr_arg(val) -> str:
+    """Like ``repr``, but sends large ``bytes`` as base64 if it's more compact.
+
+    Non-printable bytes ``repr`` to 4-character escapes.
+    Decoded on-device by ``__belay_b64`` from the startup snippet.
+    """
+    if type(val) is bytes and len(val) > _B64_MIN_LEN:
+        val_repr = repr(val)
+        encoded = f"__belay_b64({repr(b2a_base64(val, newline=False).decode())})"
+        return encoded if len(encoded) < len(val_repr) else val_repr
+    return repr(val)
+
+
+def _repr_args(args: tuple) -> str:
+    if len(args) == 1:
+        return f"({_repr_arg(args[0])},)"
+    return "(" + ", ".join(_repr_arg(x) for x in args) + ")"
+
+
+def _repr_kwargs(kwargs: dict) -> str:
+    return "{" + ", ".join(f"{repr(k)}: {_repr_arg(v)}" for k, v in kwargs.items()) + "}"
+
 
 class Executer(Registry, suffix="Executer"):
     def __init__(self, device):
@@ -74,12 +101,12 @@ class _GlobalExecuter(Executer, skip=True):
             cmd = src_code
             bound_arguments = signature.bind(*args, **kwargs)
             bound_arguments.apply_defaults()
-            arg_assign_cmd = "\n".join(f"{name}={repr(val)}" for name, val in bound_arguments.arguments.items())
+            arg_assign_cmd = "\n".join(f"{name}={_repr_arg(val)}" for name, val in bound_arguments.arguments.items())
             if arg_assign_cmd:
                 cmd = arg_assign_cmd + "\n" + cmd
 
             try:
-                self._belay_device._traceback_execute(src_file, src_lineno, name, cmd, record=record)
+                self._belay_device._traceback_execute(src_file, src_lineno, name, cmd, record=record, minify=False)
             except Exception:
                 if not ignore_errors:
                     raise
@@ -134,10 +161,10 @@ class TaskExecuter(Executer):
 
         @wraps(f)
         def func_executer(*args, **kwargs):
-            cmd = f"{name}(*{repr(args)}, **{repr(kwargs)})"
+            cmd = f"{name}(*{_repr_args(args)}, **{_repr_kwargs(kwargs)})"
 
             return self._belay_device._traceback_execute(
-                src_file, src_lineno, name, cmd, record=record, trusted=trusted
+                src_file, src_lineno, name, cmd, record=record, trusted=trusted, minify=False
             )
 
         @wraps(f)
@@ -146,8 +173,10 @@ class TaskExecuter(Executer):
                 raise NotImplementedError("Recording of generator tasks is currently not supported.")
             # Step 1: Create the on-device generator
             gen_identifier = random_python_identifier()
-            cmd = f"{gen_identifier} = {name}(*{repr(args)}, **{repr(kwargs)})"
-            self._belay_device._traceback_execute(src_file, src_lineno, name, cmd, record=False, trusted=trusted)
+            cmd = f"{gen_identifier} = {name}(*{_repr_args(args)}, **{_repr_kwargs(kwargs)})"
+            self._belay_device._traceback_execute(
+                src_file, src_lineno, name, cmd, record=False, trusted=trusted, minify=False
+            )
             # Step 2: Create the host generator that invokes ``next()`` on-device.
 
             def gen_inner():
@@ -162,11 +191,12 @@ class TaskExecuter(Executer):
                             cmd,
                             record=False,
                             trusted=trusted,
+                            minify=False,
                         )
                 except StopIteration:
                     pass
                 # Delete the exhausted generator on-device.
-                self._belay_device(f"del {gen_identifier}")
+                self._belay_device(f"del {gen_identifier}", minify=False)
 
             return gen_inner()
 
@@ -215,8 +245,8 @@ class ThreadExecuter(Executer):
 
         @wraps(f)
         def executer(*args, **kwargs):
-            cmd = f"import _thread; _thread.start_new_thread({name}, {repr(args)}, {repr(kwargs)})"
-            self._belay_device._traceback_execute(src_file, src_lineno, name, cmd, record=record)
+            cmd = f"import _thread; _thread.start_new_thread({name}, {_repr_args(args)}, {_repr_kwargs(kwargs)})"
+            self._belay_device._traceback_execute(src_file, src_lineno, name, cmd, record=record, minify=False)
 
         if register:
             setattr(self, name, executer)
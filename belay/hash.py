@@ -6,13 +6,14 @@ def fnv1a(fn: Union[str, Path]) -> int:
     """Compute the FNV-1a 32-bit hash of a file."""
     fn = Path(fn)
     h = 0x811C9DC5
-    size = 1 << 32
-    with fn.open("rb") as f:
+    prime = 0x01000193
+    mask = 0xFFFFFFFF
+    # Unbuffered; we already read in large chunks.
+    with fn.open("rb", buffering=0) as f:
         while True:
-            data = f.read(65536)
+            data = f.read(262144)
             if not data:
                 break
             for byte in data:
-                h = h ^ byte
-                h = (h * 0x01000193) % size
+                h = ((h ^ byte) * prime) & mask
     return h
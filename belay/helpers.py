@@ -4,6 +4,7 @@ import sys
 from functools import lru_cache, partial, wraps
 
 from . import snippets
+from ._minify import minify as minify_code
 
 if sys.version_info < (3, 9, 0):
     import importlib_resources
@@ -23,6 +24,9 @@ def random_python_identifier(n=16):
 
 
 @lru_cache
-def read_snippet(name):
+def read_snippet(name, minify=False):
     resource = f"{name}.py"
-    return importlib_resources.files(snippets).joinpath(resource).read_text()
+    snippet = importlib_resources.files(snippets).joinpath(resource).read_text()
+    if minify:
+        snippet = minify_code(snippet)
+    return snippet
@@ -1,24 +1,15 @@
 """Pydantic models for validation Belay configuration.
 """
 
-from functools import partial
 from pathlib import Path
 from typing import Dict, List, Optional
 
-try:
-    from pydantic.v1 import BaseModel as PydanticBaseModel
-    from pydantic.v1 import validator
-except ImportError:
-    from pydantic import BaseModel as PydanticBaseModel
-    from pydantic import validator
-
-validator_reuse = partial(validator, allow_reuse=True)
-prevalidator_reuse = partial(validator_reuse, pre=True)
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic import ConfigDict, field_validator
 
 
 class BaseModel(PydanticBaseModel):
-    class Config:
-        allow_mutation = False
+    model_config = ConfigDict(frozen=True)
 
 
 class DependencySourceConfig(BaseModel):
@@ -38,6 +29,48 @@ def _dependencies_name_validator(dependencies) -> dict:
     return dependencies
 
 
+def _preprocess_str(group_value: str) -> List[dict]:
+    return [
+        {
+            "uri": group_value,
+            "rename_to_init": True,
+        }
+    ]
+
+
+def _preprocess_list(group_value: list) -> list:
+    group_value_out = []
+    for elem in group_value:
+        if isinstance(elem, str):
+            group_value_out.append(
+                {
+                    "uri": elem,
+                }
+            )
+        elif isinstance(elem, list):
+            # pydantic only converts ``ValueError`` (not ``TypeError``) into a ``ValidationError``.
+            raise ValueError("Cannot have double nested lists in dependency specification.")  # noqa: TRY004
+        elif isinstance(elem, (dict, DependencySourceConfig)):
+            group_value_out.append(elem)
+        else:
+            raise ValueError(f"Unsupported dependency specification type {type(elem)}.")  # noqa: TRY004
+    return group_value_out
+
+
+def _preprocess_dict(group_value: dict) -> List[dict]:
+    group_value = group_value.copy()
+    group_value.setdefault("rename_to_init", True)
+    return [group_value]
+
+
+_dependency_preprocessors = {
+    str: _preprocess_str,
+    list: _preprocess_list,
+    dict: _preprocess_dict,
+    DependencySourceConfig: lambda x: x,  # Nothing to do
+}
+
+
 def _dependencies_preprocessor(dependencies) -> Dict[str, List[dict]]:
     """Preprocess various dependencies based on dtype.
 
@@ -48,40 +81,11 @@ def _dependencies_preprocessor(dependencies) -> Dict[str, List[dict]]:
     """
     out = {}
     for group_name, group_value in dependencies.items():
-        if isinstance(group_value, str):
-            group_value = [
-                {
-                    "uri": group_value,
-                    "rename_to_init": True,
-                }
-            ]
-        elif isinstance(group_value, list):
-            group_value_out = []
-            for elem in group_value:
-                if isinstance(elem, str):
-                    group_value_out.append(
-                        {
-                            "uri": elem,
-                        }
-                    )
-                elif isinstance(elem, list):
-                    raise TypeError("Cannot have double nested lists in dependency specification.")
-                elif isinstance(elem, (dict, DependencySourceConfig)):
-                    group_value_out.append(elem)
-                else:
-                    raise NotImplementedError
-            group_value = group_value_out
-        elif isinstance(group_value, dict):
-            group_value = group_value.copy()
-            group_value.setdefault("rename_to_init", True)
-            group_value = [group_value]
-        elif isinstance(group_value, DependencySourceConfig):
-            # Nothing to do
-            pass
-        else:
-            raise TypeError
-
-        out[group_name] = group_value
+        try:
+            preprocessor = _dependency_preprocessors[type(group_value)]
+        except KeyError:
+            raise ValueError(f"Unsupported dependency specification type {type(group_value)}.") from None
+        out[group_name] = preprocessor(group_value)
 
     return out
 
@@ -106,11 +110,12 @@ class GroupConfig(BaseModel):
     ##############
     # VALIDATORS #
     ##############
-    _v_dependencies_preprocessor = prevalidator_reuse("dependencies")(_dependencies_preprocessor)
-    _v_dependencies_names = validator_reuse("dependencies")(_dependencies_name_validator)
+    _v_dependencies_preprocessor = field_validator("dependencies", mode="before")(_dependencies_preprocessor)
+    _v_dependencies_names = field_validator("dependencies")(_dependencies_name_validator)
 
-    @validator("dependencies")
-    def max_1_rename_to_init(packages: dict):
+    @field_validator("dependencies")
+    @classmethod
+    def max_1_rename_to_init(cls, packages: dict):
         rename_to_init_count = {}
         for package_name, dependency in walk_dependencies(packages):
             rename_to_init_count.setdefault(package_name, 0)
@@ -141,10 +146,11 @@ class BelayConfig(BaseModel):
     ##############
     # VALIDATORS #
     ##############
-    _v_dependencies_preprocessor = prevalidator_reuse("dependencies")(_dependencies_preprocessor)
-    _v_dependencies_names = validator_reuse("dependencies")(_dependencies_name_validator)
+    _v_dependencies_preprocessor = field_validator("dependencies", mode="before")(_dependencies_preprocessor)
+    _v_dependencies_names = field_validator("dependencies")(_dependencies_name_validator)
 
-    @validator("group")
+    @field_validator("group")
+    @classmethod
     def main_not_in_group(cls, v):
         if "main" in v:
             raise ValueError(
@@ -66,17 +66,13 @@ from pathlib import Path
 from threading import Lock, Thread
 from typing import Union
 
+from pydantic import ValidationError
+
 from .exceptions import BelayException, ConnectionFailedError, DeviceNotFoundError
 from .usb_specifier import UsbSpecifier
 from .utils import env_parse_bool
 from .webrepl import WebreplToSerial
 
-try:
-    from pydantic.v1.error_wrappers import ValidationError
-except ImportError:
-    from pydantic import ValidationError
-
-
 try:
     stdout = sys.stdout.buffer
 except AttributeError:
@@ -349,7 +345,7 @@ class Pyboard:
 
         if device is None:
             usb_specifier_str = os.environ.get("BELAY_DEVICE", "{}")
-            device = UsbSpecifier.parse_raw(usb_specifier_str)
+            device = UsbSpecifier.model_validate_json(usb_specifier_str)
 
         for attempt_count in itertools.count(start=attempt_start_val):
             try:
@@ -357,7 +353,7 @@ class Pyboard:
                     device = device.to_port()
                 else:
                     with contextlib.suppress(ValidationError):
-                        device = UsbSpecifier.parse_raw(device).to_port()
+                        device = UsbSpecifier.model_validate_json(device).to_port()
                 break
             except DeviceNotFoundError:
                 pass
@@ -476,13 +472,13 @@ class Pyboard:
                         f"Timed out reading until {repr(ending)}\n    Received: {repr(self._consumed_buf)}"
                     )
 
-                if not self.serial.in_waiting:
+                # ``in_waiting`` is a syscall per access (notably slow on Windows); query it once.
+                n_bytes = self.serial.in_waiting
+                if n_bytes:
+                    self._unconsumed_buf.extend(self.serial.read(min(4096, n_bytes)))
+                else:
                     time.sleep(0.001)
 
-                if self.serial.in_waiting:
-                    n_bytes = min(2048, self.serial.in_waiting)
-                    self._unconsumed_buf.extend(self.serial.read(n_bytes))
-
     def cancel_running_program(self):
         """Interrupts any running program."""
         self.serial.write(b"\r\x03\x03")  # ctrl-C twice: interrupt any running program
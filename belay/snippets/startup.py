@@ -4,3 +4,6 @@ def __belay_next(x, val):
         return x.send(val)
     except StopIteration:
         print("_BELAYS")
+def __belay_b64(s):
+    from binascii import a2b_base64
+    return a2b_base64(s)
@@ -0,0 +1,78 @@
+# Manifest maps path -> [mtime, size, hash] so unchanged files aren't re-hashed.
+# It's loaded once per sync into ``__belay_manifest`` and written back by ``__belay_manifest_end``.
+import json
+__belay_manifest = None
+__belay_manifest_dirty = False
+def __belay_manifest_get(manifest_fn):
+    global __belay_manifest
+    if __belay_manifest is None:
+        try:
+            with open(manifest_fn) as f:
+                __belay_manifest = json.load(f)
+        except (OSError, ValueError):
+            __belay_manifest = {}
+    return __belay_manifest
+def __belay_manifest_end(manifest_fn):
+    global __belay_manifest, __belay_manifest_dirty
+    if __belay_manifest_dirty:
+        tmp_fn = manifest_fn + ".tmp"
+        with open(tmp_fn, "w") as f:
+            json.dump(__belay_manifest, f)
+        try:
+            os.rename(tmp_fn, manifest_fn)
+        except OSError:
+            # Some filesystems (e.g. FAT) won't rename over an existing file.
+            os.remove(manifest_fn)
+            os.rename(tmp_fn, manifest_fn)
+    __belay_manifest = None
+    __belay_manifest_dirty = False
+def __belay_hfs_cached(fns, manifest_fn):
+    global __belay_manifest_dirty
+    manifest = __belay_manifest_get(manifest_fn)
+    buf = memoryview(bytearray(4096))
+    out = []
+    for fn in fns:
+        try:
+            stat = os.stat(fn)
+        except OSError:
+            if manifest.pop(fn, None) is not None:
+                __belay_manifest_dirty = True
+            out.append(0)
+            continue
+        entry = manifest.get(fn)
+        if entry and entry[0] == stat[8] and entry[1] == stat[6]:
+            out.append(entry[2])
+            continue
+        h = __belay_hf(fn, buf)
+        manifest[fn] = [stat[8], stat[6], h]
+        __belay_manifest_dirty = True
+        out.append(h)
+    return out
+def __belay_manifest_update(hashes, manifest_fn):
+    global __belay_manifest_dirty
+    manifest = __belay_manifest_get(manifest_fn)
+    for fn, h in hashes.items():
+        stat = os.stat(fn)
+        manifest[fn] = [stat[8], stat[6], h]
+    __belay_manifest_dirty = True
+def __belay_del_fs_cached(path, keep, manifest_fn):
+    # Also forget deleted files; a recreated file may match a stale mtime/size.
+    global __belay_manifest_dirty
+    __belay_del_fs(path, keep)
+    if not path:
+        path = "/"
+    elif not path.endswith("/"):
+        path += "/"
+    manifest = __belay_manifest_get(manifest_fn)
+    stale = []
+    for fn in manifest:
+        if not fn.startswith(path):
+            continue
+        parent = fn
+        while parent and parent not in keep:
+            parent = parent[:parent.rfind("/")]
+        if not parent:
+            stale.append(fn)
+    for fn in stale:
+        del manifest[fn]
+        __belay_manifest_dirty = True
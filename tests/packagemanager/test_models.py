@@ -1,13 +1,9 @@
 import pydantic
 import pytest
+from pydantic import ValidationError
 
 from belay.packagemanager import GroupConfig
 
-try:
-    from pydantic.v1.error_wrappers import ValidationError
-except ImportError:
-    from pydantic import ValidationError
-
 
 def test_group_config_multiple_rename_to_init():
     dependencies = {
@@ -18,3 +14,26 @@ def test_group_config_multiple_rename_to_init():
     }
     with pytest.raises(ValidationError):
         GroupConfig(dependencies=dependencies)
+
+
+def test_group_config_dependencies_preprocessing():
+    dependencies = {
+        "str_package": "foo",
+        "list_package": ["bar", {"uri": "baz"}],
+        "dict_package": {"uri": "qux"},
+    }
+    config = GroupConfig(dependencies=dependencies)
+    assert [x.uri for x in config.dependencies["str_package"]] == ["foo"]
+    assert config.dependencies["str_package"][0].rename_to_init
+    assert [x.uri for x in config.dependencies["list_package"]] == ["bar", "baz"]
+    assert not any(x.rename_to_init for x in config.dependencies["list_package"])
+    assert config.dependencies["dict_package"][0].rename_to_init
+
+
+def test_group_config_dependencies_invalid_type():
+    with pytest.raises(ValidationError):
+        GroupConfig(dependencies={"package": 5})
+    with pytest.raises(ValidationError):
+        GroupConfig(dependencies={"package": [["foo"]]})
+    with pytest.raises(ValidationError):
+        GroupConfig(dependencies={"package": ["foo", 5]})
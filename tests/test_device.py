@@ -54,6 +54,31 @@ def test_device_task(mocker, mock_device):
     assert mock_device._traceback_execute.call_args.args[-1] == "foo(*(1,), **{'b': 2})"
 
 
+def test_device_task_large_bytes(mocker, mock_device):
+    mock_device._traceback_execute = mocker.MagicMock()
+
+    @mock_device.task
+    def foo(a, b=None):
+        pass
+
+    data = bytes(range(256)) * 4
+    foo(data, b=b"small")
+    cmd = mock_device._traceback_execute.call_args.args[-1]
+    assert cmd.startswith("foo(*(__belay_b64('")
+    assert cmd.endswith("'),), **{'b': b'small'})")
+    assert len(cmd) < len(repr(data))
+
+    # Decode the same way the device would.
+    namespace = {"foo": lambda *args, **kwargs: (args, kwargs)}
+    exec(belay.device.read_snippet("startup").replace("import os, sys", ""), namespace)
+    assert eval(cmd, namespace) == ((data,), {"b": b"small"})
+
+    # Printable data is more compact as a plain ``repr``.
+    text = b"a" * 1024
+    foo(text)
+    assert mock_device._traceback_execute.call_args.args[-1] == f"foo(*({text!r},), **{{}})"
+
+
 def test_device_thread(mocker, mock_device):
     mock_device._traceback_execute = mocker.MagicMock()
 
@@ -89,7 +114,7 @@ def test_device_traceback_execute(mocker, mock_device, tmp_path):
 
     src_lineno = 2
     name = "foo"
-    cmd = None  # Doesn't matter; mocked
+    cmd = "foo()"  # Doesn't matter; mocked
     expected_msg = (
         "Traceback (most recent call last):\r\n"
         '  File "<stdin>", line 1, in <module>\r\n'
@@ -123,6 +148,25 @@ def test_parse_belay_response_r():
     assert belay.device.parse_belay_response("_BELAYRFalse") is False
 
 
+def test_parse_belay_response_json_fast_path():
+    assert belay.device.parse_belay_response("_BELAYR[1, -2, 3.5]\r\n") == [1, -2, 3.5]
+    assert belay.device.parse_belay_response("_BELAYR-7\r\n") == -7
+    # Not valid JSON; falls back to ``ast.literal_eval``.
+    assert belay.device.parse_belay_response("_BELAYR[1, True, None]") == [1, True, None]
+    assert belay.device.parse_belay_response("_BELAYR[(1, 2), b'a']") == [(1, 2), b"a"]
+    assert belay.device.parse_belay_response("_BELAYR['a', {'b': 1}]") == ["a", {"b": 1}]
+    assert belay.device.parse_belay_response("_BELAYR1j") == 1j
+
+
+def test_compact_repr():
+    assert belay.device._compact_repr(["/a", "/b"]) == "['/a','/b']"
+    assert belay.device._compact_repr({"/a": 1, "/b": 2}) == "{'/a':1,'/b':2}"
+    assert belay.device._compact_repr({"/a"}) == "{'/a'}"
+    assert belay.device._compact_repr(set()) == "set()"
+    assert belay.device._compact_repr([]) == "[]"
+    assert eval(belay.device._compact_repr({"/a", "/b"})) == {"/a", "/b"}
+
+
 def test_overload_executer_mixing_error():
     with pytest.raises(ValueError):
 
@@ -1,3 +1,4 @@
+import json
 import os
 from pathlib import Path
 from unittest.mock import call
@@ -94,6 +95,13 @@ def hf_viper():
     exec(snippet, globals())
 
 
+@pytest.fixture
+def sync_hash_cache():
+    snippet = belay.device.read_snippet("sync_hash_cache")
+    snippet = _patch_micropython_code(snippet)
+    exec(snippet, globals())
+
+
 def test_sync_device_belay_hf(hf, tmp_path):
     """Test on-device FNV-1a hash implementation."""
     f = tmp_path / "test_file"
@@ -155,6 +163,97 @@ def test_sync_device_belay_fs_does_not_exist(sync_begin, tmp_path):
     __belay_del_fs(str(non_existing_dir))  # noqa: F821
 
 
+def test_sync_device_belay_hfs_cached(hf, sync_hash_cache, tmp_path):
+    manifest_fn = str(tmp_path / "manifest.json")
+    foobar_file = tmp_path / "foobar_file"
+    foobar_file.write_text("foobar")
+    missing_file = tmp_path / "missing_file"
+
+    return_value = __belay_hfs_cached([str(foobar_file), str(missing_file)], manifest_fn)  # noqa: F821
+    assert return_value == [0xBF9CF968, 0]
+    __belay_manifest_end(manifest_fn)  # noqa: F821
+
+    # Tamper with the cached hash to verify that the manifest is used.
+    manifest = json.loads(Path(manifest_fn).read_text())
+    manifest[str(foobar_file)][2] = 123
+    Path(manifest_fn).write_text(json.dumps(manifest))
+    assert __belay_hfs_cached([str(foobar_file)], manifest_fn) == [123]  # noqa: F821
+    __belay_manifest_end(manifest_fn)  # noqa: F821
+
+    # Changing the file invalidates the cached hash.
+    foobar_file.write_text("fooba")
+    assert __belay_hfs_cached([str(foobar_file)], manifest_fn) == [0x39AAA18A]  # noqa: F821
+    __belay_manifest_end(manifest_fn)  # noqa: F821
+
+    # Missing files are dropped from the manifest.
+    foobar_file.unlink()
+    assert __belay_hfs_cached([str(foobar_file)], manifest_fn) == [0]  # noqa: F821
+    __belay_manifest_end(manifest_fn)  # noqa: F821
+    assert json.loads(Path(manifest_fn).read_text()) == {}
+
+
+def test_sync_device_belay_manifest_single_write(mocker, hf, sync_hash_cache, tmp_path):
+    manifest_fn = str(tmp_path / "manifest.json")
+    fns = []
+    for i in range(5):
+        f = tmp_path / f"file{i}"
+        f.write_text(f"contents {i}")
+        fns.append(str(f))
+    load_spy = mocker.spy(json, "load")
+    dump_spy = mocker.spy(json, "dump")
+
+    for i in range(0, len(fns), 2):
+        __belay_hfs_cached(fns[i : i + 2], manifest_fn)  # noqa: F821
+    __belay_manifest_update({fns[0]: 123}, manifest_fn)  # noqa: F821
+    assert dump_spy.call_count == 0
+    __belay_manifest_end(manifest_fn)  # noqa: F821
+
+    assert load_spy.call_count == 0  # No manifest on-device yet.
+    assert dump_spy.call_count == 1
+    manifest = json.loads(Path(manifest_fn).read_text())
+    assert set(manifest) == set(fns)
+    assert manifest[fns[0]][2] == 123
+    assert __belay_manifest is None  # noqa: F821
+
+    # Nothing changed; the manifest isn't rewritten.
+    __belay_hfs_cached(fns, manifest_fn)  # noqa: F821
+    __belay_manifest_end(manifest_fn)  # noqa: F821
+    assert load_spy.call_count == 1
+    assert dump_spy.call_count == 1
+
+
+def test_sync_device_belay_del_fs_cached(hf, sync_begin, sync_hash_cache, tmp_path):
+    dst = tmp_path / "dst"
+    (dst / "lib").mkdir(parents=True)
+    files = [dst / "keep.txt", dst / "delete.txt", dst / "lib" / "kept_by_dir.txt"]
+    for f in files:
+        f.write_text("foobar")
+    manifest_fn = str(tmp_path / "manifest.json")
+    outside_fn = str(tmp_path / "outside.txt")
+    __belay_hfs_cached([str(f) for f in files], manifest_fn)  # noqa: F821
+    __belay_manifest[outside_fn] = [0, 0, 0]  # noqa: F821
+
+    __belay_del_fs_cached(str(dst), {str(dst / "keep.txt"), str(dst / "lib")}, manifest_fn)  # noqa: F821
+    __belay_manifest_end(manifest_fn)  # noqa: F821
+
+    assert not (dst / "delete.txt").exists()
+    manifest = json.loads(Path(manifest_fn).read_text())
+    assert set(manifest) == {str(dst / "keep.txt"), str(dst / "lib" / "kept_by_dir.txt"), outside_fn}
+
+
+def test_sync_device_belay_manifest_update(sync_hash_cache, tmp_path):
+    manifest_fn = str(tmp_path / "manifest.json")
+    foobar_file = tmp_path / "foobar_file"
+    foobar_file.write_text("foobar")
+
+    __belay_manifest_update({str(foobar_file): 0xBF9CF968}, manifest_fn)  # noqa: F821
+    __belay_manifest_end(manifest_fn)  # noqa: F821
+    __belay_manifest_update({str(foobar_file): 0xBF9CF968}, manifest_fn)  # noqa: F821
+    __belay_manifest_end(manifest_fn)  # noqa: F821
+    manifest = json.loads(Path(manifest_fn).read_text())
+    assert manifest[str(foobar_file)][1:] == [6, 0xBF9CF968]
+
+
 def test_device_sync_empty_remote(mocker, mock_device, sync_path):
     exec_side_effect = ("_BELAYR" + repr([b""] * 5) + "\r\n").encode("utf-8")
 
@@ -178,14 +277,16 @@ def test_device_sync_empty_remote(mocker, mock_device, sync_path):
         ]
     )
 
+    # Pushed largest-first; equal sizes keep path order.
     mock_device._board.fs_put.assert_has_calls(
         [
-            call(sync_path / "bar.txt", "/bar.txt"),
-            call(sync_path / "folder1/file1.txt", "/folder1/file1.txt"),
             call(
                 sync_path / "folder1/folder1_1/file1_1.txt",
                 "/folder1/folder1_1/file1_1.txt",
             ),
+            call(mocker.ANY, "/alpha.py"),  # Minified to a temporary file.
+            call(sync_path / "folder1/file1.txt", "/folder1/file1.txt"),
+            call(sync_path / "bar.txt", "/bar.txt"),
             call(sync_path / "foo.txt", "/foo.txt"),
         ]
     )
@@ -225,15 +326,120 @@ def test_device_sync_partial_remote(mocker, mock_device, sync_path):
 
     mock_device._board.fs_put.assert_has_calls(
         [
-            call(sync_path / "folder1/file1.txt", "/folder1/file1.txt"),
             call(
                 sync_path / "folder1/folder1_1/file1_1.txt",
                 "/folder1/folder1_1/file1_1.txt",
             ),
+            call(mocker.ANY, "/alpha.py"),  # Minified, so differs from the remote hash.
+            call(sync_path / "folder1/file1.txt", "/folder1/file1.txt"),
+        ]
+    )
+
+
+def test_device_sync_batched_remote_hashes(mocker, mock_device, sync_path):
+    def __belay_hfs(fns):
+        return [0] * len(fns)
+
+    def mock_exec(cmd, data_consumer=None):
+        out = b""
+        if cmd.startswith("print('_BELAYR' + repr(__belay_hfs"):
+
+            def print(s):
+                nonlocal out
+                out = (s + "\r\n").encode("utf-8")
+
+            eval(cmd, {"print": print, "__belay_hfs": __belay_hfs})
+        if data_consumer is not None:
+            data_consumer(out)
+        return out
+
+    mock_device._board.exec = mocker.MagicMock(side_effect=mock_exec)
+    mock_device.SYNC_HASH_BATCH_SIZE = 2
+
+    mock_device.sync(sync_path)
+
+    hfs_cmds = [
+        c.args[0]
+        for c in mock_device._board.exec.call_args_list
+        if c.args[0].startswith("print('_BELAYR' + repr(__belay_hfs")
+    ]
+    assert hfs_cmds == [
+        "print('_BELAYR' + repr(__belay_hfs(['/alpha.py','/bar.txt'])))",
+        "print('_BELAYR' + repr(__belay_hfs(['/folder1/file1.txt','/folder1/folder1_1/file1_1.txt'])))",
+        "print('_BELAYR' + repr(__belay_hfs(['/foo.txt'])))",
+    ]
+    assert mock_device._board.fs_put.call_count == 5
+
+
+def test_device_sync_cache_hashes(mocker, mock_device, sync_path):
+    def __belay_hfs_cached(fns, manifest_fn):
+        return [0] * len(fns)
+
+    def mock_exec(cmd, data_consumer=None):
+        out = b""
+        if cmd.startswith("print('_BELAYR' + repr(__belay_hfs_cached"):
+
+            def print(s):
+                nonlocal out
+                out = (s + "\r\n").encode("utf-8")
+
+            eval(cmd, {"print": print, "__belay_hfs_cached": __belay_hfs_cached})
+        if data_consumer is not None:
+            data_consumer(out)
+        return out
+
+    mock_device._board.exec = mocker.MagicMock(side_effect=mock_exec)
+
+    mock_device.sync(sync_path / "folder1", cache_hashes=True)
+
+    file1_hash = device_sync_support.fnv1a(sync_path / "folder1" / "file1.txt")
+    file1_1_hash = device_sync_support.fnv1a(sync_path / "folder1" / "folder1_1" / "file1_1.txt")
+    cmds = [x.args[0] for x in mock_device._board.exec.call_args_list]
+    assert any(cmd.startswith("__belay_del_fs_cached('/',{") for cmd in cmds)
+    mock_device._board.exec.assert_has_calls(
+        [
+            call(
+                "print('_BELAYR' + repr(__belay_hfs_cached(['/file1.txt','/folder1_1/file1_1.txt'],'/.belay_manifest.json')))",
+                data_consumer=mocker.ANY,
+            ),
+            call(
+                f"__belay_manifest_update({{'/folder1_1/file1_1.txt':{file1_1_hash},'/file1.txt':{file1_hash}}},'/.belay_manifest.json');"
+                "__belay_manifest_end('/.belay_manifest.json')",
+                data_consumer=mocker.ANY,
+            ),
         ]
     )
 
 
+def test_device_sync_cache_hashes_batched(mocker, mock_device, sync_path):
+    def __belay_hfs_cached(fns, manifest_fn):
+        return [0] * len(fns)
+
+    def mock_exec(cmd, data_consumer=None):
+        out = b""
+        if cmd.startswith("print('_BELAYR' + repr(__belay_hfs_cached"):
+
+            def print(s):
+                nonlocal out
+                out = (s + "\r\n").encode("utf-8")
+
+            eval(cmd, {"print": print, "__belay_hfs_cached": __belay_hfs_cached})
+        if data_consumer is not None:
+            data_consumer(out)
+        return out
+
+    mock_device._board.exec = mocker.MagicMock(side_effect=mock_exec)
+    mock_device.SYNC_HASH_BATCH_SIZE = 2
+
+    mock_device.sync(sync_path, cache_hashes=True)
+
+    cmds = [x.args[0] for x in mock_device._board.exec.call_args_list]
+    assert sum(cmd.startswith("print('_BELAYR' + repr(__belay_hfs_cached") for cmd in cmds) == 3
+    # The manifest is only written back once, by the final command.
+    assert sum("__belay_manifest_end" in cmd for cmd in cmds[1:]) == 1
+    assert cmds[-1].endswith("__belay_manifest_end('/.belay_manifest.json')")
+
+
 def test_discover_files_dirs_dir(tmp_path):
     (tmp_path / "file1.ext").touch()
     (tmp_path / "file2.ext").touch()
@@ -328,6 +534,48 @@ def test_discover_files_dirs_dir_ignore_folder(tmp_path):
     ]
 
 
+def test_discover_files_dirs_symlink_dir(tmp_path):
+    (tmp_path / "folder1").mkdir()
+    (tmp_path / "folder1" / "file1.ext").touch()
+    (tmp_path / "link").symlink_to(tmp_path / "folder1", target_is_directory=True)
+
+    src_files, src_dirs, _ = belay.device.discover_files_dirs(
+        remote_dir="/foo/bar",
+        local_file_or_folder=tmp_path,
+    )
+
+    # Like ``Path.rglob``, the symlinked directory is listed but not recursed into.
+    src_files = [x.relative_to(tmp_path) for x in src_files]
+    src_dirs = [x.relative_to(tmp_path) for x in src_dirs]
+    assert src_files == [Path("folder1/file1.ext")]
+    assert src_dirs == [Path("folder1"), Path("link")]
+
+
+def test_discover_files_dirs_unreadable_dir(mocker, tmp_path):
+    (tmp_path / "file1.ext").touch()
+    (tmp_path / "folder1").mkdir()
+    (tmp_path / "folder1" / "file2.ext").touch()
+
+    scandir = os.scandir
+
+    def mock_scandir(path):
+        if path == str(tmp_path / "folder1"):
+            raise PermissionError
+        return scandir(path)
+
+    mocker.patch("belay.device_sync_support.os.scandir", side_effect=mock_scandir)
+
+    src_files, src_dirs, _ = belay.device.discover_files_dirs(
+        remote_dir="/foo/bar",
+        local_file_or_folder=tmp_path,
+    )
+
+    src_files = [x.relative_to(tmp_path) for x in src_files]
+    src_dirs = [x.relative_to(tmp_path) for x in src_dirs]
+    assert src_files == [Path("file1.ext")]
+    assert src_dirs == [Path("folder1")]
+
+
 def test_discover_files_dirs_empty(tmp_path):
     remote_dir = "/foo/bar"
     src_files, src_dirs, dst_files = belay.device.discover_files_dirs(
@@ -457,6 +705,41 @@ def test_preprocess_src_file_default_generic(tmp_path):
     assert actual == Path("foo/bar/baz.generic")
 
 
+def test_preprocess_src_file_hash_cached(tmp_path, mocker):
+    spy = mocker.spy(device_sync_support, "fnv1a")
+    src_file = tmp_path / "foo.txt"
+    src_file.write_text("foobar")
+
+    _, src_hash = device_sync_support.preprocess_src_file_hash(tmp_path, src_file, False, None)
+    assert src_hash == 0xBF9CF968
+    _, src_hash = device_sync_support.preprocess_src_file_hash(tmp_path, src_file, False, None)
+    assert src_hash == 0xBF9CF968
+    assert spy.call_count == 1
+
+    # Modifying the file invalidates the cached hash.
+    src_file.write_text("fooba")
+    _, src_hash = device_sync_support.preprocess_src_file_hash(tmp_path, src_file, False, None)
+    assert src_hash == 0x39AAA18A
+    assert spy.call_count == 2
+
+
+def test_preprocess_src_file_untransformed(tmp_path):
+    src_dir = tmp_path / "src"
+    tmp_dir = tmp_path / "tmp"
+    tmp_dir.mkdir()
+    src_dir.mkdir()
+    (src_dir / "foo.bin").write_bytes(b"foo")
+    (src_dir / "bar.py").write_text("bar = 1\n")
+
+    assert device_sync_support.preprocess_src_file(tmp_dir, src_dir / "foo.bin", True, None) == src_dir / "foo.bin"
+    assert device_sync_support.preprocess_src_file(tmp_dir, src_dir / "bar.py", False, None) == src_dir / "bar.py"
+    assert not any(tmp_dir.iterdir())
+
+    transformed = device_sync_support.preprocess_src_file(tmp_dir, src_dir / "bar.py", True, None)
+    assert tmp_dir in transformed.parents
+    assert transformed.read_text() == "bar=1\n"
+
+
 def test_generate_dst_dirs():
     dst = "/foo/bar"
     src = Path("/bloop/bleep")
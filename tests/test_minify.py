@@ -1,4 +1,4 @@
-from belay._minify import minify
+from belay._minify import _minify_cached, minify, minify_cached
 
 expected = """def foo():
  if True:
@@ -158,3 +158,16 @@ print('l4',l4)
 print('l5',l5)
 """
     assert res == expected
+
+
+def test_minify_cached():
+    code = "def foo():\n    # comment\n    pass\n"
+    _minify_cached.cache_clear()
+    assert minify_cached(code) == minify(code)
+    assert minify_cached(code) == minify(code)
+    assert _minify_cached.cache_info().hits == 1
+
+    # Large code bypasses the cache.
+    large_code = code * 1000
+    assert minify_cached(large_code) == minify(large_code)
+    assert _minify_cached.cache_info().currsize == 1
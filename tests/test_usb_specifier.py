@@ -63,3 +63,8 @@ def test_usb_specifier_no_matches(mock_comports):
 def test_usb_specifier_multiple_matches(mock_comports):
     with pytest.raises(InsufficientSpecifierError):
         UsbSpecifier(manufacturer="Belay Industries").to_port()
+
+
+def test_usb_specifier_numeric_serial_number():
+    spec = UsbSpecifier.model_validate_json('{"serial_number": 12345}')
+    assert spec.serial_number == "12345"